@@ -9,86 +9,142 @@ Robust linkml_to_puml.py
 
 Usage:
   python tools/linkml_to_puml.py <input.linkml.yaml> <output_puml>
+  python tools/linkml_to_puml.py --info <input.linkml.yaml>
 """
+import os
 import sys
+from itertools import islice
 from pathlib import Path
 import yaml
 
+# Shared empty fallbacks for missing YAML sections; read-only, never mutate
+_EMPTY: dict = {}
+_EMPTY_LIST: tuple = ()
+
+# Prefer the libyaml-backed loader when PyYAML was built with it
+Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 def safe_load(path: Path):
-    with path.open("r", encoding="utf-8") as fh:
-        return yaml.safe_load(fh)
+    # libyaml detects the encoding itself, so hand it the raw bytes
+    with path.open("rb") as fh:
+        return yaml.load(fh, Loader=Loader)
+
+def safe_load_header(path: Path, max_bytes: int = 4096):
+    """Parse the first `max_bytes` of a YAML file; keys past the cut are missing."""
+    with path.open("rb") as fh:
+        head = fh.read(max_bytes)
+        truncated = bool(fh.read(1))
+    if truncated:
+        # drop the partial last line so we never parse half a scalar
+        head = head[:head.rfind(b"\n") + 1]
+    try:
+        doc = yaml.load(head, Loader=Loader)
+    except yaml.YAMLError:
+        return safe_load(path)
+    if not isinstance(doc, dict):
+        return safe_load(path)
+    if truncated and doc:
+        # the last top-level value may continue past the cut (e.g. a block scalar)
+        doc.pop(next(reversed(doc)))
+    return doc
 
 def normalize_name(n: str) -> str:
     return str(n).replace(" ", "_").replace("-", "_")
 
-def attribute_line(sname: str, sdef: dict) -> str:
-    """Return a single attribute line for a class box."""
-    r = sdef.get("range", "string")
-    mult = sdef.get("multivalued", False)
-    ident = sdef.get("identifier", False)
-    prefix = "+" if ident else "-"
-    suffix = "[]" if mult else ""
-    desc = sdef.get("description", "")
-    # Keep description short and safe (escape newlines)
-    desc_short = str(desc).replace("\n", " ").strip()
-    if desc_short:
-        return f"  {prefix} {sname} : {r}{suffix}  // {desc_short[:120]}"
-    else:
-        return f"  {prefix} {sname} : {r}{suffix}"
-
-def class_to_puml(name: str, cdef: dict, slots: dict) -> str:
-    lines = []
-    lines.append(f"class {name} {{")
-    for sname in (cdef.get("slots") or []):
-        sdef = slots.get(sname, {}) or {}
-        lines.append(attribute_line(sname, sdef))
-    lines.append("}")
-    return "\n".join(lines)
+def class_to_puml(name: str, cdef: dict, slots: dict, w, attr_cache: dict = None) -> None:
+    """Write a class box to `w`; share `attr_cache` across classes to format each slot once."""
+    if attr_cache is None:
+        attr_cache = {}
+    cache_get = attr_cache.get
+    slots_get = slots.get
+    w(f"class {name} {{\n")
+    for sname in (cdef.get("slots") or _EMPTY_LIST):
+        line = cache_get(sname)
+        if line is None:
+            sdef = slots_get(sname) or _EMPTY
+            # one attribute line per slot, with identifier/multivalued markers
+            r = sdef.get("range", "string")
+            prefix = "+" if sdef.get("identifier") else "-"
+            suffix = "[]" if sdef.get("multivalued") else ""
+            desc = sdef.get("description")
+            # Keep description short and safe (escape newlines)
+            desc_short = str(desc).replace("\n", " ").strip() if desc else ""
+            if desc_short:
+                if len(desc_short) > 120:
+                    desc_short = desc_short[:120]
+                line = f"  {prefix} {sname} : {r}{suffix}  // {desc_short}\n"
+            else:
+                line = f"  {prefix} {sname} : {r}{suffix}\n"
+            attr_cache[sname] = line
+        w(line)
+    w("}\n")
 
 def generate_puml_from_linkml(linkml: dict, out_puml: Path):
     classes = linkml.get("classes", {}) or {}
     slots = linkml.get("slots", {}) or {}
     enums = linkml.get("enums", {}) or {}
+    class_names = frozenset(classes)
 
-    lines = ["@startuml", f"title Auto-generated diagram from {out_puml.name}", "skinparam classAttributeIconSize 0", ""]
-
-    # Emit enums as a small package (optional)
-    if enums:
-        lines.append('package "Enums" {')
-        for ename, edef in enums.items():
-            vals = edef.get("permissible_values", []) or []
-            lines.append(f'class {ename} <<enumeration>> {{')
-            for v in vals[:40]:
-                # safe representation of enum values
-                lines.append(f'  {v}')
-            lines.append("}")
-        lines.append("}")
-        lines.append("")
-
-    # Emit every class, even empty
-    for cname, cdef in classes.items():
-        lines.append(class_to_puml(cname, cdef or {}, slots))
-        lines.append("")
-
-    # Emit relationships for slots whose range is another class
-    rels = []
-    for sname, sdef in slots.items():
-        rng = sdef.get("range")
-        if isinstance(rng, str) and rng in classes:
-            # find classes that own this slot
+    # Stream to a temp file next to the output and swap it in once complete,
+    # so a failure part-way never leaves a truncated .puml behind
+    out_puml.parent.mkdir(parents=True, exist_ok=True)
+    tmp_puml = out_puml.with_name(out_puml.name + ".tmp")
+    try:
+        with tmp_puml.open("w", encoding="utf-8") as fh:
+            w = fh.write
+            w(f"@startuml\ntitle Auto-generated diagram from {out_puml.name}\nskinparam classAttributeIconSize 0\n\n")
+
+            # Emit enums as a small package (optional)
+            if enums:
+                w('package "Enums" {\n')
+                for ename, edef in enums.items():
+                    vals = edef.get("permissible_values", []) or []
+                    w(f'class {ename} <<enumeration>> {{\n')
+                    if vals:
+                        # first 40 values in one write; islice also accepts dict-style values
+                        w("\n".join(f'  {v}' for v in islice(vals, 40)))
+                        w("\n")
+                    w("}\n")
+                w("}\n\n")
+
+            # Emit every class, even empty
+            attr_cache = {}
             for cname, cdef in classes.items():
-                if sname in (cdef.get("slots") or []):
-                    mult = sdef.get("multivalued", False)
-                    multiplicity = '"0..*"' if mult else '"1"'
-                    rels.append(f'{cname} --> {rng} : {sname}')
-    if rels:
-        lines.append("\n".join(rels))
-        lines.append("")
+                class_to_puml(cname, cdef or _EMPTY, slots, w, attr_cache)
+                w("\n")
 
-    lines.append("@enduml")
-
-    out_puml.parent.mkdir(parents=True, exist_ok=True)
-    out_puml.write_text("\n".join(lines), encoding="utf-8")
+            # Emit relationships for slots whose range is another class
+            # index slot -> owning classes once instead of scanning every class per slot
+            owners = {}
+            owners_get = owners.get
+            for cname, cdef in classes.items():
+                for s in (cdef or _EMPTY).get("slots") or _EMPTY_LIST:
+                    owned_by = owners_get(s)
+                    if owned_by is None:
+                        owners[s] = [cname]
+                    # classes are visited in order, so a repeat can only be the last entry
+                    elif owned_by[-1] != cname:
+                        owned_by.append(cname)
+
+            rels = []
+            add_rel = rels.append
+            for sname, sdef in slots.items():
+                rng = sdef.get("range")
+                # CSafeLoader scalars are exact str, so a type check is enough
+                if type(rng) is str and rng in class_names:
+                    for cname in owners_get(sname, _EMPTY_LIST):
+                        add_rel(f'{cname} --> {rng} : {sname}')
+            if rels:
+                for rel in rels:
+                    w(rel)
+                    w("\n")
+                w("\n")
+
+            w("@enduml")
+        os.replace(tmp_puml, out_puml)
+    except BaseException:
+        tmp_puml.unlink(missing_ok=True)
+        raise
 
     return {
         "classes_emitted": list(classes.keys()),
@@ -96,11 +152,32 @@ def generate_puml_from_linkml(linkml: dict, out_puml: Path):
         "out": str(out_puml),
     }
 
-def main(argv):
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv
     if len(argv) < 3:
         print("Usage: tools/linkml_to_puml.py <input.linkml.yaml> <output_puml>")
+        print("       tools/linkml_to_puml.py --info <input.linkml.yaml>")
         sys.exit(2)
 
+    if argv[1] == "--info":
+        # metadata only: no need to parse the classes/slots body
+        input_path = Path(argv[2])
+        if not input_path.exists():
+            print(f"ERROR: input file not found: {input_path}")
+            sys.exit(1)
+        info_keys = ("id", "name", "version")
+        doc = safe_load_header(input_path)
+        if isinstance(doc, dict) and not all(k in doc for k in info_keys):
+            # header cut missed some metadata, read the whole file
+            doc = safe_load(input_path)
+        if not isinstance(doc, dict):
+            print("ERROR: empty or invalid LinkML file")
+            sys.exit(1)
+        for key in info_keys:
+            print(f"{key}: {doc.get(key, '')}")
+        return
+
     input_path = Path(argv[1])
     out_arg = Path(argv[2])
 
@@ -130,4 +207,4 @@ def main(argv):
     print("Wrote:", result["out"])
 
 if __name__ == "__main__":
-    main(sys.argv)
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -4,7 +4,8 @@ Extract OpenAPI components/schemas into separate JSON Schema files.
 Usage:
   python tools/oas_extract_schemas.py path/to/openapi.yaml schemas/
 """
-import sys, os, json
+import sys, os, json, pickle, datetime, hashlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 try:
@@ -13,6 +14,31 @@ except Exception as e:
     print("PyYAML required. Run: pip install pyyaml")
     raise
 
+def _json_default(obj):
+    # YAML dates/timestamps: emit ISO strings like orjson does
+    if isinstance(obj, (datetime.date, datetime.datetime)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _json_dumps(obj):
+    # match orjson: UTF-8 output rather than \u escapes
+    return json.dumps(obj, indent=2, ensure_ascii=False, default=_json_default).encode('utf-8')
+
+# orjson is optional; it serialises straight to bytes and is much faster
+try:
+    import orjson
+    _HAVE_ORJSON = True
+    def _dumps(obj):
+        try:
+            # non-str keys (e.g. `200:`) become "200", as stdlib json does
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits, which stdlib json handles
+            return _json_dumps(obj)
+except ImportError:
+    _HAVE_ORJSON = False
+    _dumps = _json_dumps
+
 if len(sys.argv) < 3:
     print("Usage: oas_extract_schemas.py <openapi.yaml> <outdir>")
     sys.exit(2)
@@ -20,17 +46,77 @@ if len(sys.argv) < 3:
 openapi_path = Path(sys.argv[1])
 outdir = Path(sys.argv[2])
 outdir.mkdir(parents=True, exist_ok=True)
+outdir_str = os.fspath(outdir)  # plain str paths for the per-schema writes
+
+# Prefer the libyaml-backed loader when PyYAML was built with it
+Loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
 
-spec = yaml.safe_load(openapi_path.read_text(encoding='utf-8'))
+# Reuse a previous parse if the spec is unchanged since it was cached.
+# The cache lives in the user's cache dir, never beside the spec, and the
+# plain-text key line is checked before any pickle data is loaded.
+resolved = openapi_path.resolve()
+cache_dir = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'flex_api'
+cache_path = cache_dir / (hashlib.sha256(os.fsencode(resolved)).hexdigest() + '.pickle')
+st = openapi_path.stat()
+key = f"{st.st_mtime_ns} {st.st_size} {resolved}\n".encode('utf-8', 'surrogateescape')
+spec = None
+try:
+    with open(cache_path, 'rb') as fh:
+        if fh.readline() == key:
+            spec = pickle.load(fh)
+except Exception:
+    # missing, corrupt or incompatible cache (e.g. pickle protocol 5 on an
+    # older Python): just parse the YAML
+    spec = None
+
+if spec is None:
+    with open(openapi_path, 'rb') as fh:
+        spec = yaml.load(fh, Loader=Loader)
+    tmp_path = cache_path.with_name(cache_path.name + f'.{os.getpid()}.tmp')
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, 'wb') as fh:
+            fh.write(key)
+            pickle.dump(spec, fh, protocol=5)
+        os.replace(tmp_path, cache_path)
+    except Exception:
+        pass  # cache is best-effort (e.g. read-only home, unpicklable spec)
+    finally:
+        tmp_path.unlink(missing_ok=True)
 components = spec.get('components', {}) or {}
 schemas = components.get('schemas', {}) or {}
 
-for name, schema in schemas.items():
+SCHEMA_DIALECT = "http://json-schema.org/draft/2020-12/schema"
+
+def _write_json(name, json_schema):
+    # serialise before opening so a failure doesn't leave an empty file behind
+    data = _dumps(json_schema)
+    out_path = os.path.join(outdir_str, f"{name}.json")
+    with open(out_path, 'wb') as f:
+        f.write(data)
+    return out_path
+
+def _write_one(item):
+    name, schema = item
     # Create a basic JSON Schema wrapper referencing the OAS schema
-    json_schema = {"$schema": "http://json-schema.org/draft/2020-12/schema", "title": name}
+    json_schema = {"$schema": SCHEMA_DIALECT, "title": name}
     # Convert OAS subset directly (OAS schemas already JSON Schema-compatible)
     json_schema.update(schema)
+    return _write_json(name, json_schema)
 
-    out_path = outdir / f"{name}.json"
-    out_path.write_text(json.dumps(json_schema, indent=2), encoding='utf-8')
-    print("Wrote", out_path)
\ No newline at end of file
+if _HAVE_ORJSON:
+    # serialisation holds the GIL either way; the pool only overlaps the
+    # per-schema file open/write syscalls
+    with ThreadPoolExecutor(max_workers=min(16, (os.cpu_count() or 4) * 2)) as ex:
+        for out_path in ex.map(_write_one, schemas.items()):
+            print("Wrote", out_path)
+else:
+    # without orjson, write serially so one wrapper dict can be reused
+    # (a shared buffer is not safe to use from the pool)
+    buf = {}
+    for name, schema in schemas.items():
+        buf.clear()
+        buf["$schema"] = SCHEMA_DIALECT
+        buf["title"] = name
+        buf.update(schema)
+        print("Wrote", _write_json(name, buf))